@@ -1,6 +1,62 @@
 """Configuration settings for TikTok downloader with PEP 8 compliance."""
+import configparser
+import functools
 import os
-from typing import Optional
+from typing import Dict, Optional
+
+
+def _scan_properties(text: str) -> Dict[str, str]:
+    """
+    Parse properties line by line, skipping lines that are not key=value.
+
+    Args:
+        text: Contents of the properties file.
+
+    Returns:
+        Dict[str, str]: Property names mapped to their values; the first
+            definition of a key wins.
+    """
+    properties = {}
+    for line in text.splitlines():
+        if '=' in line and not line.strip().startswith('#'):
+            key, value = line.strip().split('=', 1)
+            properties.setdefault(key.strip(), value.strip())
+    return properties
+
+
+@functools.lru_cache(maxsize=1)
+def _load_properties() -> Dict[str, str]:
+    """
+    Parse tik-tok-scraper.properties once and cache the result.
+
+    The file is read as INI; keys from every section are merged, and
+    keys placed before the first section header are accepted too. If
+    the file is not valid INI (a stray line, or a key defined twice in
+    one section) it is scanned line by line instead, so startup never
+    fails on it. Either way the first definition of a key wins.
+
+    Returns:
+        Dict[str, str]: Property names mapped to their values, or an
+            empty dict if the file does not exist.
+    """
+    try:
+        with open('tik-tok-scraper.properties', 'r') as file:
+            text = file.read()
+    except FileNotFoundError:
+        return {}
+
+    parser = configparser.RawConfigParser()
+    parser.optionxform = str  # Keep property names case-sensitive
+    try:
+        parser.read_string(f"[{configparser.DEFAULTSECT}]\n" + text)
+    except configparser.Error:
+        return _scan_properties(text)
+
+    properties = dict(parser.defaults())
+    for section in parser.sections():
+        for key, value in parser.items(section):
+            properties.setdefault(key, value)
+    return properties
 
 
 def read_property(
@@ -17,23 +73,36 @@ def read_property(
     Returns:
         Optional[str]: Property value or default_value if not found.
     """
+    return _load_properties().get(property_name, default_value)
+
+
+def read_int_property(property_name: str, default_value: int) -> int:
+    """
+    Read a positive integer property from tik-tok-scraper.properties.
+
+    Args:
+        property_name: Name of the property to read.
+        default_value: Value used if the property is missing or is not a
+            positive integer.
+
+    Returns:
+        int: Property value or default_value.
+    """
+    value = read_property(property_name)
     try:
-        with open('tik-tok-scraper.properties', 'r') as file:
-            for line in file:
-                if '=' in line and not line.strip().startswith('#'):
-                    key, value = line.strip().split('=', 1)
-                    if key.strip() == property_name:
-                        return value.strip()
-    except FileNotFoundError:
-        pass
-    return default_value
+        number = int(value) if value is not None else default_value
+    except ValueError:
+        return default_value
+    return number if number > 0 else default_value
 
 
+@functools.lru_cache(maxsize=32)
 def get_folder_path(folder_name: str) -> str:
     """
     Get the download folder path from properties.
 
-    Creates the folder if it doesn't exist.
+    Creates the folder if it doesn't exist. The result is cached per
+    folder name, so the folder is only created on the first call.
 
     Args:
         folder_name: Name of the subfolder within download path.
@@ -0,0 +1,204 @@
+"""Live terminal rendering of the download table."""
+import asyncio
+import shutil
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+# Minimum seconds between redraws of the in-progress rows (10 Hz)
+REFRESH_INTERVAL = 0.1
+
+# ANSI sequences: move the cursor up N lines to column 0, clear below it
+_CURSOR_UP = "\x1b[{}F".format
+_CLEAR_BELOW = "\x1b[J"
+
+
+class LiveTable:
+    """
+    Download table where every running download has its own line.
+
+    Finished rows are printed once, permanently and in row order, above
+    a block holding one line per running download or per finished row
+    still waiting for an earlier one. That block is redrawn in place as
+    a single write, at most every REFRESH_INTERVAL seconds, so
+    concurrent downloads never overwrite each other. When stdout is not
+    a terminal only finished rows are printed.
+
+    Safe to call from the event loop and from worker threads. Frames
+    are written to stdout directly, or handed to an emit callback such
+    as a queue feeding write_frames.
+    """
+
+    def __init__(
+        self,
+        first_row: int = 1,
+        interval: float = REFRESH_INTERVAL,
+        emit: Optional[Callable[[str], None]] = None
+    ) -> None:
+        """
+        Create an empty table.
+
+        Args:
+            first_row: Number of the first row; rows are numbered
+                consecutively from it.
+            interval: Minimum seconds between progress-only redraws.
+            emit: Receives each frame in order instead of stdout; it is
+                called with the table lock held and must not block.
+        """
+        self._interval = interval
+        self._emit = emit
+        self._next_row = first_row
+        self._active: Dict[int, List[str]] = {}  # row -> [prefix, status]
+        self._done: Dict[int, str] = {}  # finished, waiting for order
+        self._finished: List[str] = []
+        self._drawn = 0
+        self._last_draw = 0.0
+        self._lock = threading.Lock()
+
+    def start(self, row_num: int, prefix: str, status: str) -> None:
+        """
+        Add a running row and draw it immediately.
+
+        Args:
+            row_num: Row number, also used to order running rows.
+            prefix: Fixed columns of the row.
+            status: Initial status column.
+        """
+        with self._lock:
+            self._active[row_num] = [prefix, status]
+            self._draw(force=True)
+
+    def update(self, row_num: int, status: str) -> None:
+        """
+        Change the status column of a running row.
+
+        The screen is only redrawn if REFRESH_INTERVAL has passed since
+        the last redraw.
+
+        Args:
+            row_num: Row number passed to start().
+            status: New status column.
+        """
+        with self._lock:
+            row = self._active.get(row_num)
+            if row is None:
+                return
+            row[1] = status
+            self._draw(force=False)
+
+    def finish(self, row_num: int, line: str) -> None:
+        """
+        Record a row's final line.
+
+        The line is printed permanently once every earlier row has
+        finished too; until then it stays in the live block.
+
+        Args:
+            row_num: Row number passed to start(), if it was started.
+            line: Complete final line, without a newline.
+        """
+        with self._lock:
+            self._active.pop(row_num, None)
+            self._done[row_num] = line
+            while self._next_row in self._done:
+                self._finished.append(self._done.pop(self._next_row))
+                self._next_row += 1
+            self._draw(force=True)
+
+    def _draw(self, force: bool) -> None:
+        """
+        Write finished rows and redraw the live block in one write.
+
+        Must be called with the lock held.
+
+        Args:
+            force: Redraw even if REFRESH_INTERVAL has not passed.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_draw < self._interval:
+            return
+        self._last_draw = now
+
+        parts = [line + "\n" for line in self._finished]
+        self._finished.clear()
+
+        if sys.stdout.isatty():
+            if self._drawn:
+                parts.insert(0, _CURSOR_UP(self._drawn) + _CLEAR_BELOW)
+            lines = self._live_lines()
+            # Running rows must not wrap, or the cursor-up count is off
+            width = shutil.get_terminal_size().columns - 1
+            parts.extend(line[:width] + "\n" for line in lines)
+            self._drawn = len(lines)
+
+        if not parts:
+            return
+        frame = "".join(parts)
+        if self._emit is not None:
+            self._emit(frame)
+        else:
+            sys.stdout.write(frame)
+            sys.stdout.flush()
+
+    def _live_lines(self) -> List[str]:
+        """
+        Build the live block, fitting it in the terminal.
+
+        The cursor cannot move back up to lines that have scrolled off,
+        so once the block would be taller than the terminal, finished
+        rows waiting for an earlier one are collapsed into one line,
+        and running rows that still do not fit are counted instead.
+
+        Must be called with the lock held.
+
+        Returns:
+            List[str]: Lines of the live block, without newlines.
+        """
+        height = max(shutil.get_terminal_size().lines - 1, 2)
+        rows = dict(self._done)
+        for row_num, (prefix, status) in self._active.items():
+            rows[row_num] = prefix + status
+        if len(rows) <= height:
+            return [line for _, line in sorted(rows.items())]
+
+        lines = [
+            f"  … {len(self._done)} finished, waiting for "
+            f"#{self._next_row}"
+        ] if self._done else []
+        running = [
+            prefix + status
+            for _, (prefix, status) in sorted(self._active.items())
+        ]
+        room = height - len(lines)
+        if len(running) > room:
+            hidden = len(running) - room + 1
+            running = running[:room - 1] + [f"  … {hidden} more running"]
+        return lines + running
+
+
+async def write_frames(frames: "asyncio.Queue[Optional[str]]") -> None:
+    """
+    Own stdout for a batch: write queued frames until None arrives.
+
+    Frames that queued up while the previous write was in progress are
+    joined into a single write.
+
+    Args:
+        frames: Queue of output strings, ended by a None sentinel.
+    """
+    done = False
+    while not done:
+        frame = await frames.get()
+        if frame is None:
+            return
+        parts = [frame]
+        while not frames.empty():
+            frame = frames.get_nowait()
+            if frame is None:
+                done = True
+                break
+            parts.append(frame)
+        sys.stdout.write("".join(parts))
+        sys.stdout.flush()
@@ -1,26 +1,145 @@
 """Video downloading functionality using SnapTik."""
+import asyncio
+import functools
+import glob
 import os
-import sys
-from typing import Optional, Tuple, Callable, Any
+import queue
+import re
+import shelve
+import shutil
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from typing import (
+    Optional, Tuple, Callable, Any, Iterator, List, Dict, Sequence
+)
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import WebDriverException
 from datetime import datetime
-from config import get_folder_path
+from config import get_folder_path, read_int_property, read_property
+from display import LiveTable
 
 
-# Global browser instance
-browser = None
+# Number of headless browsers that may resolve SnapTik links at once
+BROWSER_POOL_SIZE = read_int_property('BROWSER_POOL_SIZE', 4)
+
+SNAPTIK_URL = "https://snaptik.app/"
+SNAPTIK_API_URL = "https://snaptik.app/abc2.php"
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Referer': SNAPTIK_URL
+}
+
+# Headers for fetching video files straight from TikTok's CDN
+TIKTOK_HEADERS = {
+    'User-Agent': REQUEST_HEADERS['User-Agent'],
+    'Referer': 'https://www.tiktok.com/'
+}
+
+# API-provided CDN URLs tried before SnapTik; they usually all fail the
+# same way (e.g. 403), so only the first few are worth a request
+DIRECT_URL_ATTEMPTS = 2
+
+# Shared HTTP session so SnapTik requests and video downloads reuse
+# pooled keep-alive connections instead of a new TLS handshake each time
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.5)
+)
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+
+# Patterns for scraping the SnapTik form token and download anchors
+_TOKEN_RE = re.compile(r'name="token"[^>]*value="([^"]+)"')
+_DOWNLOAD_ANCHOR_RE = re.compile(r'<a\b[^>]*\bdownload-file\b[^>]*>')
+_HREF_RE = re.compile(r'href="([^"]+)"')
+
+# Anchor targets that are not real video links: non-HTTP, in-page
+# fragments, or pointing back at the SnapTik site itself
+_BAD_LINK_RE = re.compile(
+    r'^(?!https?://)|#$|^https?://(?:www\.)?snaptik\.app(?:/|$)'
+)
+
+# Clears the SnapTik form and previous results so a loaded page can be
+# reused for the next video instead of navigating again
+SNAPTIK_RESET_SCRIPT = """
+var input = document.querySelector('input[name="url"]');
+if (!input) { return false; }
+input.value = '';
+document.querySelectorAll('a.download-file').forEach(function (el) {
+    el.remove();
+});
+return true;
+"""
+
+# Locators for the SnapTik form elements
+_URL_INPUT_LOCATOR = (By.NAME, "url")
+_SUBMIT_BUTTON_LOCATOR = (By.CSS_SELECTOR, "button[type='submit']")
+_DOWNLOAD_BUTTON_LOCATOR = (By.CLASS_NAME, "download-file")
+
+# Seconds to wait for each SnapTik form step, and how often to re-check;
+# Selenium's default 500 ms poll adds up to half a second per step
+SNAPTIK_WAIT_TIMEOUT = 15
+SNAPTIK_POLL_INTERVAL = 0.1
+
+# Read size per iteration while streaming a video (256 KiB)
+CHUNK_SIZE = 256 * 1024
+
+# Buffer size for the output file so writes hit disk in 1 MiB batches
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Block size for copying a single-stream response straight to disk
+STREAM_COPY_SIZE = 1024 * 1024
+
+# Files at least this large are fetched as parallel byte ranges
+SEGMENT_MIN_SIZE = 4 * 1024 * 1024
+SEGMENT_COUNT = 4
+
+# Progress bar pieces, sliced per redraw instead of rebuilt
+_BAR_WIDTH = 10
+_BAR_FULL = '█' * _BAR_WIDTH
+_BAR_EMPTY = '░' * _BAR_WIDTH
+
+# Table row layout, shared with the header printed by the UI; live rows
+# use the prefix and append the status column separately
+ROW_FMT = "{:<4} {:<20} {:<15} {:<12} {:<20}".format
+_ROW_PREFIX = "{:<4} {:<20} {:<15} {:<12} ".format
+
+# Resolved download links older than this are resolved again (seconds)
+LINK_CACHE_TTL = 24 * 60 * 60
+_VIDEO_CACHE_LOCK = threading.Lock()
+
+# HEAD results for CDN URLs probed ahead of their download, by URL;
+# each entry is consumed by the download_file call that needs it
+_PREFETCHED_PROBES: Dict[str, Tuple[str, int, bool]] = {}
+_PREFETCH_LOCK = threading.Lock()
+
+# Strips the dashes from a YYYY-MM-DD date for use in filenames
+_DATE_DASHES = str.maketrans('', '', '-')
+
+# Author attribute holding the username, remembered per author type
+_AUTHOR_FIELDS: Dict[type, str] = {}
 
 
 def init_browser() -> webdriver.Chrome:
     """
     Initialize Chrome browser for downloads.
 
+    Uses the ChromeDriver at CHROMEDRIVER_PATH if that property is set;
+    otherwise Selenium Manager, built into Selenium, locates a driver.
+
     Returns:
         webdriver.Chrome: Configured Chrome WebDriver instance.
     """
@@ -29,271 +148,1139 @@ def init_browser() -> webdriver.Chrome:
     options.add_argument('--disable-gpu')
     options.add_argument('--no-sandbox')
     options.add_argument('--disable-dev-shm-usage')
+    # SnapTik only needs the form and the result markup, so skip images
+    # and background traffic to make page loads lighter
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-background-networking')
     options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    options.add_experimental_option(
+        'prefs', {'profile.managed_default_content_settings.images': 2}
+    )
 
-    service = Service(ChromeDriverManager().install())
+    service = Service(read_property('CHROMEDRIVER_PATH'))
     return webdriver.Chrome(service=service, options=options)
 
 
+class BrowserPool:
+    """
+    Fixed-size pool of headless Chrome browsers shared between threads.
+
+    Browsers are created lazily, so no Chrome process is started unless
+    the HTTP resolution path fails. Each browser is used by one thread at
+    a time; browsers that misbehave are reset, and only quit and replaced
+    if they no longer respond.
+    """
+
+    def __init__(self, size: int, reset_script: Optional[str] = None) -> None:
+        """
+        Create an empty pool.
+
+        Args:
+            size: Maximum number of browsers alive at the same time.
+            reset_script: Optional JavaScript that resets an already
+                loaded page for reuse; it must return true on success.
+        """
+        self._reset_script = reset_script
+        self._idle: queue.Queue = queue.Queue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._browsers: List[webdriver.Chrome] = []
+
+    @contextmanager
+    def browser(self, url: str) -> Iterator[webdriver.Chrome]:
+        """
+        Borrow a browser from the pool, blocking until one is free.
+
+        Args:
+            url: Page the browser is navigated to before it is handed out.
+
+        Yields:
+            webdriver.Chrome: Browser reserved for the calling thread.
+        """
+        with self._slots:
+            browser = self._acquire(url)
+            try:
+                yield browser
+            except Exception as e:
+                if "chrome" in str(e).lower() or "driver" in str(e).lower():
+                    self._recycle(browser)
+                else:
+                    self._idle.put(browser)
+                raise
+            else:
+                self._idle.put(browser)
+
+    def close(self) -> None:
+        """Quit every browser created by the pool."""
+        with self._lock:
+            browsers, self._browsers = self._browsers, []
+            self._idle = queue.Queue()
+
+        for browser in browsers:
+            try:
+                browser.quit()
+            except Exception:
+                pass
+
+    def _acquire(self, url: str) -> webdriver.Chrome:
+        """Return an idle browser (or a new one) navigated to url."""
+        try:
+            browser = self._idle.get_nowait()
+        except queue.Empty:
+            browser = self._create()
+        else:
+            # An idle browser may have died since its last use; only
+            # replace it if navigating actually fails
+            try:
+                if not self._reuse_page(browser, url):
+                    browser.get(url)
+                return browser
+            except WebDriverException:
+                self._discard(browser)
+                browser = self._create()
+
+        try:
+            browser.get(url)
+        except Exception:
+            self._discard(browser)
+            raise
+        return browser
+
+    def _reuse_page(self, browser: webdriver.Chrome, url: str) -> bool:
+        """Reset the loaded page in place if the browser is still on url."""
+        if not self._reset_script or not browser.current_url.startswith(url):
+            return False
+        try:
+            return bool(browser.execute_script(self._reset_script))
+        except WebDriverException:
+            return False
+
+    def _create(self) -> webdriver.Chrome:
+        """Start a new browser and track it for shutdown."""
+        browser = init_browser()
+        with self._lock:
+            self._browsers.append(browser)
+        return browser
+
+    def _recycle(self, browser: webdriver.Chrome) -> None:
+        """
+        Reset a misbehaving browser and return it to the pool.
+
+        Clearing cookies and cache is far cheaper than a Chrome restart;
+        the browser is only quit if it no longer responds.
+        """
+        try:
+            browser.delete_all_cookies()
+            browser.execute_cdp_cmd('Network.clearBrowserCache', {})
+            browser.get('about:blank')
+        except Exception:
+            self._discard(browser)
+        else:
+            self._idle.put(browser)
+
+    def _discard(self, browser: webdriver.Chrome) -> None:
+        """Quit a broken browser and stop tracking it."""
+        with self._lock:
+            if browser in self._browsers:
+                self._browsers.remove(browser)
+        try:
+            browser.quit()
+        except Exception:
+            pass
+
+
+_BROWSER_POOL = BrowserPool(BROWSER_POOL_SIZE, SNAPTIK_RESET_SCRIPT)
+
+
+def drop_page_cache(fd: int) -> None:
+    """
+    Hint the kernel that a written file will not be read back soon.
+
+    Videos are written once and never re-read by this program, so their
+    pages are released from the page cache instead of evicting more
+    useful data during large batches. No-op where posix_fadvise is
+    unavailable.
+
+    Args:
+        fd: File descriptor of a file whose data has been fully written.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+
+
+class DownloadCancelled(Exception):
+    """Raised inside a download once its batch has been cancelled."""
+
+
+class ProgressTracker:
+    """
+    Thread-safe byte counter that reports whole-percent progress changes.
+
+    Shared by all segments of a download so the callback sees a single
+    monotonically increasing percentage. Since it sees every block, it
+    is also where a cancelled download is stopped.
+    """
+
+    def __init__(
+        self,
+        total_size: int,
+        progress_callback: Optional[Callable[[int], None]],
+        downloaded: int = 0,
+        cancel: Optional[threading.Event] = None
+    ) -> None:
+        """
+        Create a tracker.
+
+        Args:
+            total_size: Expected size in bytes (0 if unknown).
+            progress_callback: Optional callback for progress updates.
+            downloaded: Bytes already present, e.g. when resuming.
+            cancel: Event that aborts the download once set.
+        """
+        self._total_size = total_size
+        self._callback = progress_callback
+        self._downloaded = downloaded
+        self._cancel = cancel
+        self._last_progress = -1
+        self._lock = threading.Lock()
+
+    def add(self, size: int) -> None:
+        """
+        Record newly written bytes and report progress if it changed.
+
+        Args:
+            size: Number of bytes just written.
+
+        Raises:
+            DownloadCancelled: If the cancel event has been set.
+        """
+        if self._cancel is not None and self._cancel.is_set():
+            raise DownloadCancelled()
+        if not self._callback or self._total_size <= 0:
+            return
+        with self._lock:
+            self._downloaded += size
+            progress = min(
+                int((self._downloaded / self._total_size) * 100), 100
+            )
+            # Only report whole-percent changes
+            if progress == self._last_progress:
+                return
+            self._last_progress = progress
+        self._callback(progress)
+
+
+class CountingReader:
+    """
+    File-like wrapper that reports bytes read to a ProgressTracker.
+
+    Lets shutil.copyfileobj drive the copy loop while progress is still
+    tracked per block.
+    """
+
+    def __init__(self, raw: Any, tracker: ProgressTracker) -> None:
+        """
+        Wrap a readable stream.
+
+        Args:
+            raw: Underlying stream, e.g. a urllib3 response.
+            tracker: Tracker credited with every block read.
+        """
+        self._raw = raw
+        self._tracker = tracker
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read up to size bytes and record them with the tracker.
+
+        Args:
+            size: Maximum number of bytes to read.
+
+        Returns:
+            bytes: Data read; empty at end of stream.
+        """
+        data = self._raw.read(size)
+        self._tracker.add(len(data))
+        return data
+
+
+def probe_download(
+    url: str,
+    headers: Dict[str, str] = REQUEST_HEADERS
+) -> Tuple[str, int, bool]:
+    """
+    Find the final URL, size and range support of a download.
+
+    Args:
+        url: URL to probe.
+        headers: HTTP headers to send.
+
+    Returns:
+        Tuple[str, int, bool]: Final URL after redirects, size in bytes
+            (0 if unknown) and whether byte ranges are supported.
+    """
+    try:
+        response = _SESSION.head(
+            url, timeout=15, headers=headers, allow_redirects=True
+        )
+        response.raise_for_status()
+    except requests.RequestException:
+        return url, 0, False
+
+    total_size = int(response.headers.get('content-length', 0) or 0)
+    accepts_ranges = response.headers.get('accept-ranges', '') == 'bytes'
+    return response.url, total_size, accepts_ranges
+
+
+def fetch_range(
+    url: str,
+    fd: int,
+    start: int,
+    end: int,
+    tracker: ProgressTracker,
+    headers: Dict[str, str] = REQUEST_HEADERS
+) -> bool:
+    """
+    Download one byte range and write it at its offset in the file.
+
+    Blocks are read straight from the raw response and written with
+    os.pwrite, so segments never share a file position; short writes
+    are continued from a memoryview without copying the block.
+
+    Args:
+        url: URL to download from.
+        fd: File descriptor of the preallocated destination file.
+        start: First byte of the range.
+        end: Last byte of the range (inclusive).
+        tracker: Shared progress tracker.
+        headers: HTTP headers to send.
+
+    Returns:
+        bool: True if the whole range was written, False otherwise.
+    """
+    range_headers = dict(headers, Range=f"bytes={start}-{end}")
+    try:
+        with _SESSION.get(url, stream=True, timeout=30,
+                          headers=range_headers) as response:
+            if response.status_code != 206:
+                return False
+
+            raw = response.raw
+            raw.decode_content = True
+            offset = start
+            while chunk := raw.read(CHUNK_SIZE):
+                view = memoryview(chunk)
+                while view:
+                    written = os.pwrite(fd, view, offset)
+                    view = view[written:]
+                    offset += written
+                tracker.add(len(chunk))
+    except (requests.RequestException, Urllib3HTTPError, OSError):
+        return False
+
+    return offset == end + 1
+
+
+def download_segmented(
+    url: str,
+    part_path: str,
+    total_size: int,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    headers: Dict[str, str] = REQUEST_HEADERS,
+    cancel: Optional[threading.Event] = None
+) -> bool:
+    """
+    Download a file as SEGMENT_COUNT parallel byte ranges.
+
+    The destination is preallocated and each range is written at its own
+    offset, so no reassembly step is needed.
+
+    Args:
+        url: URL to download from (must support byte ranges).
+        part_path: Temporary destination file path.
+        total_size: Size of the file in bytes.
+        progress_callback: Optional callback for progress updates (0-100).
+        headers: HTTP headers to send.
+        cancel: Event that aborts the download once set.
+
+    Returns:
+        bool: True if every range was downloaded, False otherwise.
+
+    Raises:
+        DownloadCancelled: If cancel is set while downloading.
+    """
+    segment_size = -(-total_size // SEGMENT_COUNT)
+    ranges = [
+        (start, min(start + segment_size, total_size) - 1)
+        for start in range(0, total_size, segment_size)
+    ]
+    tracker = ProgressTracker(total_size, progress_callback, cancel=cancel)
+
+    fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            os.posix_fallocate(fd, 0, total_size)
+        except (AttributeError, OSError):
+            os.ftruncate(fd, total_size)
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            results = list(executor.map(
+                lambda r: fetch_range(url, fd, r[0], r[1], tracker, headers),
+                ranges
+            ))
+
+        if all(results):
+            drop_page_cache(fd)
+        return all(results)
+    finally:
+        os.close(fd)
+
+
+def download_stream(
+    url: str,
+    part_path: str,
+    total_size: int,
+    resume: bool,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    headers: Dict[str, str] = REQUEST_HEADERS,
+    cancel: Optional[threading.Event] = None
+) -> None:
+    """
+    Download a file over a single connection.
+
+    The raw response is copied to disk with shutil.copyfileobj in
+    STREAM_COPY_SIZE blocks rather than through iter_content.
+
+    Args:
+        url: URL to download from.
+        part_path: Temporary destination file path.
+        total_size: Expected size in bytes (0 if unknown).
+        resume: Whether to continue from an existing part_path.
+        progress_callback: Optional callback for progress updates (0-100).
+        headers: HTTP headers to send.
+        cancel: Event that aborts the download once set.
+
+    Raises:
+        DownloadCancelled: If cancel is set while downloading.
+        requests.RequestException: If the request fails.
+        urllib3.exceptions.HTTPError: If the body cannot be read fully.
+        OSError: If the file cannot be written.
+    """
+    offset = 0
+    if resume:
+        try:
+            offset = os.path.getsize(part_path)
+        except OSError:
+            offset = 0
+
+        # Finished by an earlier run that stopped before the rename
+        if offset == total_size:
+            return
+
+    if offset:
+        headers = dict(headers, Range=f"bytes={offset}-")
+
+    response = _SESSION.get(
+        url, stream=True, timeout=30, headers=headers, allow_redirects=True
+    )
+    response.raise_for_status()
+
+    # Server ignored the range request; start over
+    if response.status_code != 206:
+        offset = 0
+
+    total_size = offset + int(response.headers.get('content-length', 0))
+    tracker = ProgressTracker(total_size, progress_callback, offset, cancel)
+
+    mode = 'ab' if offset else 'wb'
+    with response, open(part_path, mode, buffering=WRITE_BUFFER_SIZE) as f:
+        response.raw.decode_content = True
+        shutil.copyfileobj(
+            CountingReader(response.raw, tracker), f, STREAM_COPY_SIZE
+        )
+
+        f.flush()
+        drop_page_cache(f.fileno())
+
+
+def remove_parts(base: str) -> None:
+    """
+    Delete partial files left for a download by any earlier attempt.
+
+    Other URLs of the same video usually have a different size, so once
+    one of them succeeds the parts of the others can never be resumed.
+
+    Args:
+        base: Part path without the ``.<size>.part`` suffix.
+    """
+    for path in glob.glob(f"{glob.escape(base)}.*.part"):
+        with suppress(OSError):
+            os.remove(path)
+
+
 def download_file(
     url: str,
     filepath: str,
-    progress_callback: Optional[Callable[[int], None]] = None
+    progress_callback: Optional[Callable[[int], None]] = None,
+    headers: Dict[str, str] = REQUEST_HEADERS,
+    part_key: Optional[str] = None,
+    cancel: Optional[threading.Event] = None
 ) -> bool:
     """
     Download a file from URL with progress tracking.
 
+    Large files on servers that support byte ranges are fetched as
+    parallel segments; otherwise a single stream is used, resuming a
+    partial file left by an earlier run. Data is written to a temporary
+    file that is renamed to filepath on success. Segmented files and
+    streams that cannot be resumed are deleted on failure; only a
+    resumable ``.part`` stream is kept for the next run, and on success
+    every part left under the same part_key is removed. A probe done
+    in advance by prefetch_download is used instead of a new HEAD.
+
     Args:
         url: URL to download from.
         filepath: Destination file path.
         progress_callback: Optional callback for progress updates (0-100).
+        headers: HTTP headers to send.
+        part_key: Stable name for the temporary file, such as the video
+            ID, so a later run finds it even if filepath has changed;
+            defaults to the file name.
+        cancel: Event that aborts the download between blocks once set.
 
     Returns:
         bool: True if download succeeded, False otherwise.
     """
+    part_path = None
+    resumable = False
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Referer': 'https://snaptik.app/'
-        }
-        
-        response = requests.get(url, stream=True, timeout=30, headers=headers, allow_redirects=True)
-        response.raise_for_status()
+        with _PREFETCH_LOCK:
+            probe = _PREFETCHED_PROBES.pop(url, None)
+        url, total_size, accepts_ranges = (
+            probe or probe_download(url, headers)
+        )
 
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
+        # Tag partial files with the expected size so a resume never
+        # appends to bytes of a different file
+        base = os.path.join(
+            os.path.dirname(filepath), part_key or os.path.basename(filepath)
+        )
+        part_path = f"{base}.{total_size}.part"
+        resumable = accepts_ranges and total_size > 0
 
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-                downloaded += len(chunk)
+        # A segmented file has holes until every range has landed, so it
+        # gets its own suffix and is never resumed, even after a crash
+        segment_path = f"{base}.{total_size}.seg"
+        with suppress(FileNotFoundError):
+            os.remove(segment_path)
 
-                if progress_callback and total_size > 0:
-                    progress = int((downloaded / total_size) * 100)
-                    progress_callback(progress)
+        if (resumable and total_size >= SEGMENT_MIN_SIZE
+                and hasattr(os, 'pwrite')
+                and not os.path.exists(part_path)):
+            try:
+                if download_segmented(url, segment_path, total_size,
+                                      progress_callback, headers, cancel):
+                    os.replace(segment_path, filepath)
+                    remove_parts(base)
+                    return True
+            finally:
+                with suppress(FileNotFoundError):
+                    os.remove(segment_path)
 
+        download_stream(
+            url, part_path, total_size, resumable, progress_callback,
+            headers, cancel
+        )
+
+        os.replace(part_path, filepath)
+        remove_parts(base)
         return True
     except Exception:
+        if part_path and not resumable:
+            with suppress(OSError):
+                os.remove(part_path)
         return False
 
 
+def resolve_link_via_http(video_url: str) -> Optional[str]:
+    """
+    Resolve the SnapTik download link with plain HTTP requests.
+
+    Posts the TikTok URL to SnapTik's form endpoint and scrapes the
+    download anchor from the returned HTML, avoiding a browser round
+    trip entirely.
+
+    Args:
+        video_url: Full TikTok video URL.
+
+    Returns:
+        Optional[str]: Download link, or None if it could not be found.
+    """
+    try:
+        page = _SESSION.get(SNAPTIK_URL, headers=REQUEST_HEADERS, timeout=15)
+        page.raise_for_status()
+
+        data = {'url': video_url, 'lang': 'en'}
+        token_match = _TOKEN_RE.search(page.text)
+        if token_match:
+            data['token'] = token_match.group(1)
+
+        response = _SESSION.post(
+            SNAPTIK_API_URL, data=data, headers=REQUEST_HEADERS, timeout=15
+        )
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+
+    # Response HTML may be embedded in a script with escaped quotes
+    html = response.text.replace('\\"', '"')
+    for anchor in _DOWNLOAD_ANCHOR_RE.finditer(html):
+        href_match = _HREF_RE.search(anchor.group(0))
+        if href_match and not _BAD_LINK_RE.search(href_match.group(1)):
+            return href_match.group(1)
+
+    return None
+
+
+def resolve_link_via_browser(video_url: str) -> Optional[str]:
+    """
+    Resolve the SnapTik download link by driving a headless browser.
+
+    Used as a fallback when the plain HTTP approach fails. A browser is
+    borrowed from the shared pool for the duration of the call.
+
+    Args:
+        video_url: Full TikTok video URL.
+
+    Returns:
+        Optional[str]: Download link, or None if the button had no link.
+    """
+    with _BROWSER_POOL.browser(SNAPTIK_URL) as browser:
+        return _submit_snaptik_form(browser, video_url)
+
+
+def _submit_snaptik_form(
+    browser: webdriver.Chrome,
+    video_url: str
+) -> Optional[str]:
+    """
+    Submit a TikTok URL through the SnapTik form in the given browser.
+
+    The browser must already be on the SnapTik page with an empty form.
+
+    Args:
+        browser: Chrome WebDriver instance to use.
+        video_url: Full TikTok video URL.
+
+    Returns:
+        Optional[str]: Download link, or None if the button had no link.
+    """
+    wait = WebDriverWait(
+        browser, SNAPTIK_WAIT_TIMEOUT, poll_frequency=SNAPTIK_POLL_INTERVAL
+    )
+
+    # Enter TikTok URL
+    url_input = wait.until(
+        EC.presence_of_element_located(_URL_INPUT_LOCATOR)
+    )
+    url_input.clear()
+    url_input.send_keys(video_url)
+
+    # Click the submit button
+    submit_button = wait.until(
+        EC.element_to_be_clickable(_SUBMIT_BUTTON_LOCATOR)
+    )
+    submit_button.click()
+
+    # Wait for download button to appear
+    download_button = wait.until(
+        EC.presence_of_element_located(_DOWNLOAD_BUTTON_LOCATOR)
+    )
+    href = download_button.get_attribute("href")
+    if not href or _BAD_LINK_RE.search(href):
+        return None
+    return href
+
+
+def resolve_snaptik_link(video_url: str) -> Optional[str]:
+    """
+    Resolve the direct video link for a TikTok URL through SnapTik.
+
+    Tries plain HTTP first and falls back to a pooled browser. Blocking;
+    async callers run it in a worker thread.
+
+    Args:
+        video_url: Full TikTok video URL.
+
+    Returns:
+        Optional[str]: Download link, or None if none could be found.
+    """
+    return (resolve_link_via_http(video_url) or
+            resolve_link_via_browser(video_url))
+
+
+def get_direct_urls(video: Any) -> List[str]:
+    """
+    Collect no-watermark CDN URLs from a video's raw API payload.
+
+    Args:
+        video: Video object (or dict) from TikTok API.
+
+    Returns:
+        List[str]: Candidate URLs, best first; empty if none are present.
+    """
+    data = getattr(video, 'as_dict', None)
+    if not isinstance(data, dict):
+        data = video if isinstance(video, dict) else {}
+    video_data = data.get('video')
+    if not isinstance(video_data, dict):
+        return []
+
+    urls = []
+    for bitrate in video_data.get('bitrateInfo') or []:
+        play_addr = bitrate.get('PlayAddr') or {}
+        urls.extend(play_addr.get('UrlList') or [])
+
+    play_addr = video_data.get('playAddr')
+    if play_addr:
+        urls.append(play_addr)
+
+    # Keep order but drop duplicates shared between bitrate variants
+    return list(dict.fromkeys(url for url in urls if url))
+
+
+@functools.lru_cache(maxsize=1)
+def _video_cache() -> shelve.Shelf:
+    """
+    Open the on-disk video cache on first use.
+
+    Returns:
+        shelve.Shelf: Cache kept in BASE_FOLDER/.cache across runs.
+    """
+    return shelve.open(os.path.join(get_folder_path('.cache'), 'videos'))
+
+
+def get_cached_video(video_id: str) -> Dict[str, Any]:
+    """
+    Look up what earlier runs recorded about a video.
+
+    Args:
+        video_id: TikTok video ID.
+
+    Returns:
+        Dict[str, Any]: May hold 'path' (downloaded file), 'url'
+            (resolved download link) and 'resolved_at' (Unix time);
+            empty if nothing is known or the cache is unavailable.
+    """
+    with _VIDEO_CACHE_LOCK:
+        try:
+            return _video_cache().get(video_id, {})
+        except Exception:
+            return {}
+
+
+def cache_video(video_id: str, **fields: Any) -> None:
+    """
+    Merge fields into the cached entry for a video.
+
+    The cache is best effort; failures to write it are ignored.
+
+    Args:
+        video_id: TikTok video ID.
+        **fields: Values to store, e.g. path, url, resolved_at.
+    """
+    with _VIDEO_CACHE_LOCK:
+        try:
+            cache = _video_cache()
+            cache[video_id] = dict(cache.get(video_id, {}), **fields)
+            cache.sync()
+        except Exception:
+            pass
+
+
+def fresh_cached_link(cached: Dict[str, Any]) -> Optional[str]:
+    """
+    Return a cached SnapTik link if it is recent enough to reuse.
+
+    Args:
+        cached: Entry returned by get_cached_video.
+
+    Returns:
+        Optional[str]: Link resolved within LINK_CACHE_TTL, or None.
+    """
+    link = cached.get('url')
+    if link and time.time() - cached.get('resolved_at', 0) < LINK_CACHE_TTL:
+        return link
+    return None
+
+
+def cached_file(cached: Dict[str, Any], folder_path: str) -> Optional[str]:
+    """
+    Return the file an earlier run downloaded into a folder, if any.
+
+    A copy in another folder, e.g. trending/ when downloading a user's
+    videos, does not count.
+
+    Args:
+        cached: Entry returned by get_cached_video.
+        folder_path: Destination folder path.
+
+    Returns:
+        Optional[str]: Cached path if it is in folder_path and still
+            exists, else None.
+    """
+    path = cached.get('path')
+    if (path and os.path.dirname(os.path.abspath(path))
+            == os.path.abspath(folder_path) and os.path.isfile(path)):
+        return path
+    return None
+
+
 def download_via_snaptik(
     username: str,
     video_id: str,
     folder: str,
     progress_callback: Optional[Callable[[int], None]] = None,
-    filename: Optional[str] = None
+    filename: Optional[str] = None,
+    direct_urls: Sequence[str] = (),
+    cancel: Optional[threading.Event] = None
 ) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Download TikTok video using SnapTik service.
 
+    Videos already downloaded into the same folder by an earlier run
+    are skipped even if the filename has changed since. CDN URLs
+    already provided by the TikTok API are tried first, then a SnapTik
+    link cached within LINK_CACHE_TTL; SnapTik is only queried if none
+    of them work. Setting cancel stops the download between blocks and
+    skips any attempt not yet started.
+
     Args:
         username: TikTok username.
         video_id: TikTok video ID.
         folder: Destination folder name.
         progress_callback: Optional callback for progress updates.
         filename: Optional custom filename (without extension).
+        direct_urls: Candidate CDN URLs from the API payload.
+        cancel: Event that aborts the download once set.
 
     Returns:
         Tuple[bool, Optional[str], Optional[str]]: Success status,
             error code, error detail.
     """
-    global browser
-
     video_url = f"https://www.tiktok.com/@{username}/video/{video_id}"
+    if cancel is None:
+        cancel = threading.Event()
+    cancelled = (False, "Cancelled", f"Download cancelled | {video_url}")
 
-    if filename:
-        filepath = f"{get_folder_path(folder)}/{filename}.mp4"
-    else:
-        filepath = f"{get_folder_path(folder)}/{video_id}.mp4"
-
-    if os.path.isfile(filepath):
-        return True, "exists", None
+    folder_path = get_folder_path(folder)
+    filepath = os.path.join(folder_path, f"{filename or video_id}.mp4")
 
     try:
-        if browser is None:
-            browser = init_browser()
+        if os.path.isfile(filepath):
+            return True, "exists", None
 
-        # Check browser health
-        try:
-            browser.title
-        except Exception:
-            browser.quit()
-            browser = init_browser()
+        cached = get_cached_video(video_id)
+        if cached_file(cached, folder_path):
+            return True, "exists", None
 
-        # Go to SnapTik
-        browser.get("https://snaptik.app/")
-        wait = WebDriverWait(browser, 15)
+        for url in direct_urls[:DIRECT_URL_ATTEMPTS]:
+            if download_file(url, filepath, progress_callback,
+                             TIKTOK_HEADERS, video_id, cancel):
+                cache_video(video_id, path=filepath)
+                return True, None, None
+            if cancel.is_set():
+                return cancelled
 
-        # Enter TikTok URL
-        url_input = wait.until(EC.presence_of_element_located((By.NAME, "url")))
-        url_input.clear()
-        url_input.send_keys(video_url)
+        cached_link = fresh_cached_link(cached)
+        if cached_link and download_file(cached_link, filepath,
+                                         progress_callback,
+                                         part_key=video_id, cancel=cancel):
+            cache_video(video_id, path=filepath)
+            return True, None, None
+        if cancel.is_set():
+            return cancelled
 
-        # Click the submit button
-        submit_button = wait.until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "button[type='submit']"))
-        )
-        submit_button.click()
+        download_link = resolve_snaptik_link(video_url)
 
-        # Wait for download button to appear
-        download_button = wait.until(
-            EC.presence_of_element_located((By.CLASS_NAME, "download-file"))
-        )
-        download_link = download_button.get_attribute("href")
-        
         if not download_link:
             return False, "No link", f"Could not find download button | {video_url}"
-        
+
+        cache_video(video_id, url=download_link, resolved_at=time.time())
+
         # Download the video
-        success = download_file(download_link, filepath, progress_callback)
-        
+        success = download_file(
+            download_link, filepath, progress_callback, part_key=video_id,
+            cancel=cancel
+        )
+
         if not success:
-            if os.path.exists(filepath):
-                try:
-                    os.remove(filepath)
-                except Exception:
-                    pass
+            if cancel.is_set():
+                return cancelled
             return False, "DL failed", f"Download failed | {video_url}"
-        
+
+        cache_video(video_id, path=filepath)
         return True, None, None
 
     except Exception as e:
         error_detail = f"Error: {str(e)[:100]} | {video_url}"
-        
-        if "chrome" in str(e).lower() or "driver" in str(e).lower():
-            try:
-                if browser:
-                    browser.quit()
-                browser = None
-            except Exception:
-                pass
-        
         return False, "Exception", error_detail
 
+    finally:
+        # Probes prefetched for URLs that were never downloaded
+        with _PREFETCH_LOCK:
+            for url in direct_urls:
+                _PREFETCHED_PROBES.pop(url, None)
+
 
-def get_video_metadata(video: Any) -> Tuple[str, int, str]:
+def format_date(value: Any) -> str:
     """
-    Extract metadata from video object.
+    Format a creation time as YYYY-MM-DD without going through strftime.
 
     Args:
-        video: Video object from TikTok API.
+        value: datetime object or Unix timestamp (int or numeric str).
 
     Returns:
-        Tuple[str, int, str]: Video ID, view count, creation date.
+        str: Formatted local date, or 'N/A' if value cannot be parsed.
     """
+    if isinstance(value, datetime):
+        return f"{value.year:04d}-{value.month:02d}-{value.day:02d}"
     try:
-        # Get view count
-        views = 0
-        if hasattr(video, 'stats') and isinstance(video.stats, dict):
-            views = int(video.stats.get('playCount', 0) or 0)
-
-        # Get creation date
-        date_str = "N/A"
-        if hasattr(video, 'create_time'):
-            if isinstance(video.create_time, datetime):
-                date_str = video.create_time.strftime("%Y-%m-%d")
-            else:
-                try:
-                    date_obj = datetime.fromtimestamp(int(video.create_time))
-                    date_str = date_obj.strftime("%Y-%m-%d")
-                except Exception:
-                    pass
+        t = time.localtime(int(value))
+    except (TypeError, ValueError, OverflowError, OSError):
+        return "N/A"
+    return f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+
+
+def resolve_author(video: Any) -> str:
+    """
+    Extract the author's username from a video object or dict.
+
+    The attribute that holds the username is remembered per author type,
+    so after the first video of a batch the lookup is a single getattr.
+
+    Args:
+        video: Video object (or dict) from TikTok API.
+
+    Returns:
+        str: Author username, or 'unknown' if it cannot be determined.
+    """
+    author = getattr(video, 'author', None)
+    if author is None and isinstance(video, dict):
+        author = video.get('author')
+    if author is None:
+        return 'unknown'
+
+    if isinstance(author, dict):
+        return (author.get('username') or
+                author.get('unique_id') or
+                author.get('uniqueId', 'unknown'))
+
+    field = _AUTHOR_FIELDS.get(type(author))
+    if field is not None:
+        name = getattr(author, field, None)
+        if name is not None:
+            return name
+
+    # Try username first (most common)
+    for field in ('username', 'unique_id', 'uniqueId'):
+        name = getattr(author, field, None)
+        if name is not None:
+            _AUTHOR_FIELDS[type(author)] = field
+            return name
+
+    return 'unknown'
+
+
+def extract_video_info(video: Any) -> Tuple[str, str, int, str]:
+    """
+    Extract ID, author, view count and date from a video in one pass.
+
+    Reads the raw API payload (``as_dict``) with plain dict lookups when
+    available, which avoids probing TikTokApi object attributes; other
+    objects fall back to a single getattr per field.
+
+    Args:
+        video: Video object (or dict) from TikTok API.
+
+    Returns:
+        Tuple[str, str, int, str]: Video ID, author username, view
+            count, creation date.
+    """
+    data = getattr(video, 'as_dict', None)
+    if not isinstance(data, dict):
+        data = video if isinstance(video, dict) else None
+
+    if data and 'id' in data:
+        video_id = str(data['id'])
+        stats = data.get('stats') or data.get('statsV2')
+        create_time = data.get('createTime')
+        author_data = data.get('author')
+    else:
+        video_id = str(getattr(video, 'id', 'unknown'))
+        stats = getattr(video, 'stats', None)
+        create_time = getattr(video, 'create_time', None)
+        author_data = None
+
+    views = 0
+    if isinstance(stats, dict):
+        try:
+            views = int(stats.get('playCount') or 0)
+        except (TypeError, ValueError):
+            pass
 
-        # Get video ID
-        video_id = str(video.id if hasattr(video, 'id') else 'unknown')
+    if isinstance(author_data, dict):
+        author = (author_data.get('uniqueId') or
+                  author_data.get('unique_id') or
+                  author_data.get('username') or 'unknown')
+    else:
+        author = resolve_author(video)
+
+    date = "N/A" if create_time is None else format_date(create_time)
+
+    return video_id, author, views, date
+
+
+def video_filename(
+    video_id: str,
+    views: int,
+    date: str,
+    row_num: int,
+    sort_choice: str
+) -> str:
+    """
+    Build the file name (without extension) a video is saved under.
+
+    Args:
+        video_id: TikTok video ID.
+        views: View count (0 if unknown).
+        date: Formatted upload date or "N/A".
+        row_num: Row number of the video in the batch.
+        sort_choice: Sorting method ('1', '2', or '3').
+
+    Returns:
+        str: Row index, sort metadata and video ID joined by '_'.
+    """
+    if sort_choice == "2":  # Most viewed
+        metadata = f"{views:010d}v" if views > 0 else "0000000000v"
+    else:  # Oldest or most recent (default)
+        metadata = (date.translate(_DATE_DASHES) if date != "N/A"
+                    else "00000000")
+
+    return f"{row_num:02d}_{metadata}_{video_id}"
+
+
+def prefetch_download(
+    video: Any,
+    folder_name: str,
+    row_num: int,
+    sort_choice: str = "1"
+) -> None:
+    """
+    Do a video's network lookups ahead of its download.
 
-        return video_id, views, date_str
+    Nothing is done if the video is already in the destination folder.
+    With CDN URLs, the first one is probed and the result kept for
+    download_file; without any, the SnapTik link is resolved and stored
+    in the video cache. Blocking; errors are ignored since the download
+    repeats whatever lookup is missing.
+
+    Args:
+        video: Video object from TikTok API.
+        folder_name: Destination folder name.
+        row_num: Row number the video will be downloaded as.
+        sort_choice: Sorting method ('1', '2', or '3').
+    """
+    try:
+        video_id, author, views, date = extract_video_info(video)
+        folder_path = get_folder_path(folder_name)
+        filename = video_filename(video_id, views, date, row_num, sort_choice)
+        if os.path.isfile(os.path.join(folder_path, f"{filename}.mp4")):
+            return
+
+        cached = get_cached_video(video_id)
+        if cached_file(cached, folder_path):
+            return
+
+        direct_urls = get_direct_urls(video)
+        if direct_urls:
+            probe = probe_download(direct_urls[0], TIKTOK_HEADERS)
+            with _PREFETCH_LOCK:
+                _PREFETCHED_PROBES[direct_urls[0]] = probe
+        elif not fresh_cached_link(cached):
+            video_url = f"https://www.tiktok.com/@{author}/video/{video_id}"
+            link = resolve_snaptik_link(video_url)
+            if link:
+                cache_video(video_id, url=link, resolved_at=time.time())
     except Exception:
-        return 'unknown', 0, 'N/A'
+        pass
 
 
 async def download_post(
     video: Any,
     folder_name: str,
     row_num: int,
-    sort_choice: str = "1"
+    sort_choice: str = "1",
+    table: Optional[LiveTable] = None,
+    executor: Optional[Executor] = None,
+    cancel: Optional[threading.Event] = None
 ) -> Tuple[bool, str, int, str, Optional[str]]:
     """
     Extract video info and initiate download with progress display.
 
+    The blocking download runs in a worker thread so several posts can
+    be downloaded concurrently; each one keeps its own live row in the
+    table until it finishes.
+
     Args:
         video: Video object from TikTok API.
         folder_name: Destination folder name.
         row_num: Row number for display.
         sort_choice: Sorting method ('1', '2', or '3').
+        table: Table shared by the batch; a private one is used if
+            omitted.
+        executor: Executor running the blocking download; the loop's
+            default executor is used if omitted.
+        cancel: Event that aborts the blocking download once set.
 
     Returns:
         Tuple[bool, str, int, str, Optional[str]]: Success status,
             video ID, views, date, error detail.
     """
-    try:
-        video_id = str(
-            video.id if hasattr(video, 'id')
-            else video.get('id', 'unknown')
-        )
-
-        author = 'unknown'
-        if hasattr(video, 'author'):
-            # Try username first (most common)
-            if hasattr(video.author, 'username'):
-                author = video.author.username
-            elif hasattr(video.author, 'unique_id'):
-                author = video.author.unique_id
-            elif hasattr(video.author, 'uniqueId'):
-                author = video.author.uniqueId
-            elif isinstance(video.author, dict):
-                author = (video.author.get('username') or
-                          video.author.get('unique_id') or
-                          video.author.get('uniqueId', 'unknown'))
-        elif isinstance(video, dict) and 'author' in video:
-            author_data = video['author']
-            author = (author_data.get('username') or
-                      author_data.get('unique_id') or
-                      author_data.get('uniqueId', 'unknown'))
+    if table is None:
+        table = LiveTable(first_row=row_num)
 
+    try:
         # Get metadata
-        video_id, views, date = get_video_metadata(video)
+        video_id, author, views, date = extract_video_info(video)
         views_str = f"{views:,}" if views > 0 else "N/A"
 
-        # Generate filename based on sort option
-        index = f"{row_num:02d}"
+        filename = video_filename(video_id, views, date, row_num, sort_choice)
 
-        if sort_choice == "2":  # Most viewed
-            metadata = f"{views:010d}v" if views > 0 else "0000000000v"
-        elif sort_choice == "3":  # Oldest
-            date_clean = (date.replace("-", "") if date != "N/A" else "00000000")
-            metadata = date_clean
-        else:  # Most recent (default)
-            date_clean = (date.replace("-", "") if date != "N/A" else "00000000")
-            metadata = date_clean
-
-        filename = f"{index}_{metadata}_{video_id}"
+        # Row columns are fixed for the whole download; only the status
+        # column changes between redraws
+        row_prefix = _ROW_PREFIX(row_num, video_id, views_str, date)
 
         # Create progress callback to update the status column
         def update_progress(percent: int) -> None:
-            """Update progress bar in terminal."""
-            bar_width = 10
-            filled = int(bar_width * percent / 100)
-            bar = '█' * filled + '░' * (bar_width - filled)
-            status = f"{bar} {percent}%"
-
-            sys.stdout.write(
-                f"\r{row_num:<4} {video_id:<20} {views_str:<15} "
-                f"{date:<12} {status:<20}"
-            )
-            sys.stdout.flush()
+            """Update this row's progress bar; redraws are throttled."""
+            filled = _BAR_WIDTH * percent // 100
+            bar = _BAR_FULL[:filled] + _BAR_EMPTY[filled:]
+            table.update(row_num, f"{bar} {percent}%")
 
-        # Print initial row
-        sys.stdout.write(
-            f"{row_num:<4} {video_id:<20} {views_str:<15} "
-            f"{date:<12} {'Starting...':<20}"
-        )
-        sys.stdout.flush()
+        # Show the row while it downloads
+        table.start(row_num, row_prefix, 'Starting...')
 
         # Download with progress using SnapTik
-        result = download_via_snaptik(
-            author, video_id, folder_name, update_progress, filename
+        result = await asyncio.get_running_loop().run_in_executor(
+            executor, download_via_snaptik,
+            author, video_id, folder_name, update_progress, filename,
+            get_direct_urls(video), cancel
         )
         success, error_code, error_detail = result
 
@@ -307,32 +1294,21 @@ async def download_post(
         else:
             status = f"✗ {error_code}" if error_code else "✗ Failed"
 
-        # Update final line
-        sys.stdout.write(
-            f"\r{row_num:<4} {video_id:<20} {views_str:<15} "
-            f"{date:<12} {status:<20}\n"
-        )
-        sys.stdout.flush()
+        # Replace the live row with its final line
+        table.finish(row_num, row_prefix + status)
 
         return success, video_id, views, date, error_detail
 
     except Exception as e:
         error_msg = str(e)[:15]
-        sys.stdout.write(
-            f"\r{row_num:<4} {'unknown':<20} {'N/A':<15} "
-            f"{'N/A':<12} {'✗ ' + error_msg:<20}\n"
+        table.finish(
+            row_num,
+            ROW_FMT(row_num, 'unknown', 'N/A', 'N/A', '✗ ' + error_msg)
         )
-        sys.stdout.flush()
         error_detail = f"Exception during download (video: {row_num}): {str(e)[:100]}"
         return False, 'unknown', 0, 'N/A', error_detail
 
 
 def cleanup_browser() -> None:
-    """Cleanup browser instance."""
-    global browser
-    if browser:
-        try:
-            browser.quit()
-        except Exception:
-            pass
-        browser = None
+    """Cleanup all pooled browser instances."""
+    _BROWSER_POOL.close()
@@ -1,5 +1,51 @@
 """Video fetching and sorting logic with PEP 8 compliance."""
-from typing import Optional, List, Any, AsyncIterator
+import functools
+import heapq
+import time
+from collections import deque
+from typing import (
+    Optional, List, Any, AsyncIterator, Dict, Deque, Tuple, FrozenSet, Callable
+)
+
+
+# Print a progress dot every this many fetched videos
+DOT_INTERVAL = 20
+
+# Sort choices that rank a fetch window rather than take the newest videos
+WINDOWED_SORTS: FrozenSet[str] = frozenset({"2", "3"})
+
+# Seconds a user's profile stats are reused before being fetched again
+USER_INFO_TTL = 300
+
+# Profile stats per username, with the monotonic time they were fetched
+_USER_INFO_CACHE: Dict[str, Tuple[float, Dict[str, int]]] = {}
+
+
+def get_view_count(video: Any) -> int:
+    """
+    Extract the view count used for "most viewed" sorting.
+
+    Reads the raw API payload (``as_dict``) when available and falls
+    back to the ``stats`` attribute.
+
+    Args:
+        video: Video object from TikTok API.
+
+    Returns:
+        int: View count, or 0 if it cannot be determined.
+    """
+    data = getattr(video, 'as_dict', None)
+    if isinstance(data, dict):
+        stats = data.get('stats') or data.get('statsV2')
+    else:
+        stats = getattr(video, 'stats', None)
+
+    if not isinstance(stats, dict):
+        return 0
+    try:
+        return int(stats.get('playCount') or 0)
+    except (TypeError, ValueError):
+        return 0
 
 
 async def fetch_and_sort_videos(
@@ -13,7 +59,9 @@ async def fetch_and_sort_videos(
     Fetch and sort videos from any source (user, trending).
 
     Reusable function to eliminate code duplication across different
-    video sources.
+    video sources. Only the videos the final selection needs are kept
+    while fetching, so memory stays bounded by count rather than by the
+    fetch window.
 
     Args:
         video_iterator: Async iterator yielding video objects.
@@ -27,10 +75,16 @@ async def fetch_and_sort_videos(
     Returns:
         List[Any]: Sorted list of video objects.
     """
-    videos = []
+    # Most viewed: min-heap of (views, -position, video) holding the top
+    # `count`; ties keep the more recent video. Oldest: the last `count`
+    # seen. Most recent: the first `count`.
+    top: List[Tuple[int, int, Any]] = []
+    oldest: Deque[Any] = deque(maxlen=count)
+    recent: List[Any] = []
+    fetched = 0
 
     # Determine fetch count based on sorting
-    if sort_choice in ["2", "3"]:
+    if sort_choice in WINDOWED_SORTS:
         fetch_count = 999999 if window_size is None else window_size
     else:
         fetch_count = count
@@ -38,13 +92,26 @@ async def fetch_and_sort_videos(
     # Fetch videos with progress feedback
     print("📡 Fetching videos", end="", flush=True)
     error_msg = None
+    next_dot = DOT_INTERVAL
 
     try:
         async for video in video_iterator:
-            videos.append(video)
-            if len(videos) >= fetch_count:
+            fetched += 1
+            if sort_choice == "2":
+                entry = (get_view_count(video), -fetched, video)
+                if len(top) < count:
+                    heapq.heappush(top, entry)
+                else:
+                    heapq.heappushpop(top, entry)
+            elif sort_choice == "3":
+                oldest.append(video)
+            else:
+                recent.append(video)
+
+            if fetched >= fetch_count:
                 break
-            if len(videos) % 20 == 0:
+            if fetched == next_dot:
+                next_dot += DOT_INTERVAL
                 print(".", end="", flush=True)
     except Exception as fetch_error:
         error_msg = str(fetch_error)
@@ -59,18 +126,18 @@ async def fetch_and_sort_videos(
         elif "session" in error_msg.lower():
             print("   Hint: Session expired - restart the application")
 
-        if not videos:
+        if not fetched:
             return []
 
-    print(f" ✓ ({len(videos)} fetched)")
+    print(f" ✓ ({fetched} fetched)")
 
     # Note about potential discrepancy
-    if fetch_count > 500 and len(videos) < fetch_count:
-        print(f"   Note: TikTok API returned {len(videos)} videos "
+    if fetch_count > 500 and fetched < fetch_count:
+        print(f"   Note: TikTok API returned {fetched} videos "
               f"(some may be private/deleted/restricted)")
 
     # Diagnose why 0 videos were fetched
-    if not videos:
+    if not fetched:
         if not error_msg:  # No exception, but also no videos
             print("\n⚠ Diagnosis: API returned 0 videos (likely causes):")
             print("   • TikTok is blocking API access to this content")
@@ -78,27 +145,31 @@ async def fetch_and_sort_videos(
             print("   • Rate limiting (wait 5-10 minutes or restart)")
         return []
 
-    # Sort videos based on choice
+    # Order the kept videos based on choice
     if sort_choice == "2":  # Most viewed
-        def get_view_count(v: Any) -> int:
-            """Extract view count from video object."""
-            try:
-                has_stats = hasattr(v, 'stats')
-                is_dict = isinstance(v.stats, dict) if has_stats else False
-                views = (v.stats.get('playCount', 0)
-                         if has_stats and is_dict else 0)
-                return int(views) if views else 0
-            except Exception:
-                return 0
-
-        videos.sort(key=get_view_count, reverse=True)
-        videos = videos[:count]
-    elif sort_choice == "3":  # Oldest
-        videos = list(reversed(videos))[:count]
-    else:  # Most recent
-        videos = videos[:count]
-
-    return videos
+        return [v for _, _, v in sorted(top, reverse=True)]
+    if sort_choice == "3":  # Oldest
+        return list(reversed(oldest))
+    return recent  # Most recent
+
+
+@functools.lru_cache(maxsize=32)
+def get_user(api: Any, username: str) -> Any:
+    """
+    Get a cached TikTok user object for a username.
+
+    Sharing one user object between get_user_info and get_user_posts
+    lets the video listing reuse the ids already loaded by user.info()
+    instead of looking the user up again.
+
+    Args:
+        api: TikTokApi instance.
+        username: TikTok username (without @ symbol).
+
+    Returns:
+        Any: TikTokApi user object.
+    """
+    return api.user(username)
 
 
 async def get_user_posts(
@@ -122,10 +193,10 @@ async def get_user_posts(
         List[Any]: Sorted list of user video objects.
     """
     try:
-        user = api.user(username)
+        user = get_user(api, username)
 
         # Create video iterator
-        if sort_choice in ["2", "3"] and window_size is None:
+        if sort_choice in WINDOWED_SORTS and window_size is None:
             fetch_count = 999999
         else:
             fetch_count = window_size or count
@@ -149,67 +220,156 @@ async def get_user_posts(
         return []
 
 
-async def get_trending_posts(api: Any, count: int) -> List[Any]:
+async def stream_posts(
+    video_iterator: AsyncIterator[Any],
+    count: int,
+    source_name: str,
+    report: Callable[[str], None] = print
+) -> AsyncIterator[Any]:
     """
-    Fetch trending posts from TikTok's For You Page.
+    Yield videos from any source as soon as they are fetched.
 
-    Note: TikTok's trending API only accepts a count parameter.
-    Videos are returned in TikTok's algorithmically curated order.
-    No client-side sorting is applied.
+    Lets downloads start while the rest of the listing is still loading.
+    A fetch error ends the stream early after reporting a hint.
 
     Args:
-        api: TikTokApi instance.
-        count: Number of trending videos to return.
+        video_iterator: Async iterator yielding video objects.
+        count: Maximum number of videos to yield.
+        source_name: Source identifier for error messages.
+        report: Receives each error and hint line; pass e.g. a list's
+            append to hold them back while the download table owns
+            stdout.
 
-    Returns:
-        List[Any]: List of trending video objects in API order.
+    Yields:
+        Any: Video objects in the order the API returns them.
     """
-    try:
-        # Create video iterator - trending API only supports count
-        video_iterator = api.trending.videos(count=count)
-
-        # Fetch without sorting (trending is pre-sorted by TikTok)
-        videos = []
-        print("📡 Fetching trending videos", end="", flush=True)
-
-        try:
-            async for video in video_iterator:
-                videos.append(video)
-                if len(videos) >= count:
-                    break
-                if len(videos) % 20 == 0:
-                    print(".", end="", flush=True)
-        except Exception as fetch_error:
-            error_msg = str(fetch_error)
-            print(f"\n✗ Fetch error: {error_msg}")
-
-            if "rate" in error_msg.lower() or "limit" in error_msg.lower():
-                print("   Hint: Rate limited - try again later or use VPN")
-            elif "session" in error_msg.lower():
-                print("   Hint: Session expired - restart the application")
-
-            if not videos:
-                return []
-
-        print(f" ✓ ({len(videos)} fetched)")
-        return videos
+    if count <= 0:
+        return
 
+    fetched = 0
+    try:
+        async for video in video_iterator:
+            yield video
+            fetched += 1
+            if fetched >= count:
+                break
     except Exception as e:
         error_msg = str(e)
-        print(f"\n✗ Error fetching trending videos: {error_msg}")
+        report(f"\n✗ Error fetching {source_name}: {error_msg}")
 
-        if "rate" in error_msg.lower() or "limit" in error_msg.lower():
-            print("   Hint: Rate limited - try again later or use VPN")
+        if "user" in error_msg.lower():
+            report("   Hint: User might be private, deleted, or "
+                   "username incorrect")
+        elif "rate" in error_msg.lower() or "limit" in error_msg.lower():
+            report("   Hint: Rate limited - try again later or use VPN")
         elif "session" in error_msg.lower():
-            print("   Hint: Session expired - restart the application")
+            report("   Hint: Session expired - restart the application")
 
-        return []
+
+def stream_user_posts(
+    api: Any,
+    username: str,
+    count: int,
+    report: Callable[[str], None] = print
+) -> AsyncIterator[Any]:
+    """
+    Stream a user's most recent posts, newest first.
+
+    Args:
+        api: TikTokApi instance.
+        username: TikTok username (without @ symbol).
+        count: Maximum number of videos to yield.
+        report: Receives fetch error and hint lines.
+
+    Returns:
+        AsyncIterator[Any]: Stream of user video objects.
+    """
+    video_iterator = get_user(api, username).videos(count=count)
+    return stream_posts(video_iterator, count, f"@{username}", report)
+
+
+def stream_trending_posts(
+    api: Any,
+    count: int,
+    report: Callable[[str], None] = print
+) -> AsyncIterator[Any]:
+    """
+    Stream trending posts from TikTok's For You Page.
+
+    Note: TikTok's trending API only accepts a count parameter.
+    Videos are yielded in TikTok's algorithmically curated order.
+
+    Args:
+        api: TikTokApi instance.
+        count: Maximum number of trending videos to yield.
+        report: Receives fetch error and hint lines.
+
+    Returns:
+        AsyncIterator[Any]: Stream of trending video objects.
+    """
+    video_iterator = api.trending.videos(count=count)
+    return stream_posts(video_iterator, count, "trending videos", report)
+
+
+def format_number(num: int) -> str:
+    """
+    Format number with K/M suffixes.
+
+    Args:
+        num: Number to format.
+
+    Returns:
+        str: Formatted number, e.g. '1.2M'.
+    """
+    if num >= 1_000_000:
+        return f"{num/1_000_000:.1f}M"
+    elif num >= 1_000:
+        return f"{num/1_000:.1f}K"
+    return str(num)
+
+
+def extract_user_stats(user: Any) -> Optional[Dict[str, int]]:
+    """
+    Extract profile statistics from an already loaded user object.
+
+    Args:
+        user: TikTokApi user object after ``user.info()``.
+
+    Returns:
+        Optional[Dict[str, int]]: Counts for 'videos', 'followers',
+            'following' and 'likes', or None if no data was loaded.
+    """
+    user_data = getattr(user, 'as_dict', None)
+    if not user_data:
+        return None
+
+    # Try different possible structures
+    if 'userInfo' in user_data:
+        stats_data = user_data.get('userInfo', {}).get('stats', {})
+    elif 'stats' in user_data:
+        stats_data = user_data.get('stats', {})
+    else:
+        stats_data = {}
+
+    # Get stats with fallbacks
+    return {
+        'videos': stats_data.get('videoCount', 0),
+        'followers': stats_data.get('followerCount', 0),
+        'following': stats_data.get('followingCount', 0),
+        'likes': (stats_data.get('heartCount', 0) or
+                  stats_data.get('heart', 0)),
+    }
 
 
 async def get_user_info(api: Any, username: str) -> bool:
     """
     Fetch and display user information.
 
+    Loads the shared user object from get_user, so a following
+    get_user_posts call reuses the loaded ids instead of fetching the
+    profile again. Stats fetched within USER_INFO_TTL seconds are shown
+    again without a request; failures are not cached.
+
     Args:
         api: TikTokApi instance.
         username: TikTok username (without @ symbol).
@@ -219,50 +379,31 @@ async def get_user_info(api: Any, username: str) -> bool:
             False otherwise.
     """
     try:
-        user = api.user(username)
-        await user.info()
-
-        # Extract user stats
-        stats = {}
-        if hasattr(user, 'as_dict') and user.as_dict:
-            user_data = user.as_dict
-
-            # Try different possible structures
-            if 'userInfo' in user_data:
-                stats_data = user_data.get('userInfo', {}).get('stats', {})
-            elif 'stats' in user_data:
-                stats_data = user_data.get('stats', {})
-            else:
-                stats_data = {}
-
-            # Get stats with fallbacks
-            followers = stats_data.get('followerCount', 0)
-            following = stats_data.get('followingCount', 0)
-            likes = (stats_data.get('heartCount', 0) or
-                     stats_data.get('heart', 0))
-            videos = stats_data.get('videoCount', 0)
-
-            # Format numbers
-            def format_number(num: int) -> str:
-                """Format number with K/M suffixes."""
-                if num >= 1_000_000:
-                    return f"{num/1_000_000:.1f}M"
-                elif num >= 1_000:
-                    return f"{num/1_000:.1f}K"
-                return str(num)
-
-            # Display user info
-            print(f"\n📊 User Info: @{username}")
-            print("─" * 50)
-            print(f"  Videos:    {format_number(videos)}")
-            print(f"  Followers: {format_number(followers)}")
-            print(f"  Following: {format_number(following)}")
-            print(f"  Likes:     {format_number(likes)}")
-            print("─" * 50)
-
-            return True
+        now = time.monotonic()
+        entry = _USER_INFO_CACHE.get(username)
+        if entry and now - entry[0] < USER_INFO_TTL:
+            stats = entry[1]
+            cached_label = " (cached)"
         else:
-            return False
+            user = get_user(api, username)
+            await user.info()
+
+            stats = extract_user_stats(user)
+            if stats is None:
+                return False
+            _USER_INFO_CACHE[username] = (now, stats)
+            cached_label = ""
+
+        # Display user info
+        print(f"\n📊 User Info: @{username}{cached_label}")
+        print("─" * 50)
+        print(f"  Videos:    {format_number(stats['videos'])}")
+        print(f"  Followers: {format_number(stats['followers'])}")
+        print(f"  Following: {format_number(stats['following'])}")
+        print(f"  Likes:     {format_number(stats['likes'])}")
+        print("─" * 50)
+
+        return True
 
     except Exception as e:
         print(f"\n⚠ Could not fetch user info: {str(e)[:50]}")
@@ -3,16 +3,102 @@
 TikTok Video Downloader with PEP 8 compliance.
 
 Downloads videos from TikTok by username or trending videos from the
-For You Page.
+For You Page. Run without arguments for the interactive menu, or pass
+--user or --trending to download once without any prompts, e.g.:
+
+    python main.py --user tiktok --sort 2 --window 200 --count 25
 """
+import argparse
 import asyncio
 import sys
-from typing import NoReturn
+from typing import List, NoReturn, Optional
 from TikTokApi import TikTokApi
-from ui import handle_username_download, handle_trending_download
+from ui import (
+    MAX_DOWNLOAD_COUNT, ainput, handle_username_download,
+    handle_trending_download, run_username_download, run_trending_download
+)
 from downloader import cleanup_browser
 
 
+def parse_count(value: str) -> int:
+    """
+    Parse the --count argument.
+
+    Args:
+        value: Raw argument value.
+
+    Returns:
+        int: Number of videos to download.
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not in
+            1..MAX_DOWNLOAD_COUNT.
+    """
+    try:
+        count = int(value)
+    except ValueError:
+        count = 0
+    if not 1 <= count <= MAX_DOWNLOAD_COUNT:
+        raise argparse.ArgumentTypeError(
+            f"must be a number from 1 to {MAX_DOWNLOAD_COUNT}"
+        )
+    return count
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments for batch mode.
+
+    Batch-only options are rejected unless --user or --trending is
+    given, --sort/--window are rejected with --trending, and --window is
+    rejected unless --sort is 2 or 3, instead of being silently ignored.
+
+    Args:
+        argv: Arguments to parse; defaults to sys.argv[1:].
+
+    Returns:
+        argparse.Namespace: Parsed arguments; user and trending are
+            unset in interactive mode.
+    """
+    parser = argparse.ArgumentParser(
+        description="Download TikTok videos by username or from "
+                    "trending. Without --user or --trending an "
+                    "interactive menu is shown."
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--user', help="TikTok username to download from")
+    source.add_argument('--trending', action='store_true',
+                        help="download trending videos")
+    # Defaults are filled in after parsing so explicit options can be
+    # told apart from omitted ones
+    parser.add_argument('--sort', choices=['1', '2', '3'],
+                        help="1 most recent, 2 most viewed, 3 oldest "
+                             "(default: 1)")
+    parser.add_argument('--window', choices=['50', '200', '500', 'all'],
+                        help="videos to rank for --sort 2/3 (default: 50)")
+    parser.add_argument('--count', type=parse_count,
+                        help="number of videos to download (default: 10)")
+    args = parser.parse_args(argv)
+
+    if args.user is None and not args.trending:
+        if (args.sort, args.window, args.count) != (None, None, None):
+            parser.error("--sort, --window and --count require --user or "
+                         "--trending")
+    elif args.trending and (args.sort or args.window):
+        parser.error("--sort and --window cannot be used with --trending")
+    elif args.window and args.sort not in ('2', '3'):
+        parser.error("--window requires --sort 2 or 3")
+
+    args.sort = args.sort or '1'
+    args.window = args.window or '50'
+    args.count = args.count or 10
+    if args.user is not None:
+        args.user = args.user.lstrip('@')
+        if not args.user:
+            parser.error("--user needs a username")
+    return args
+
+
 async def create_tiktok_session(api: TikTokApi) -> None:
     """
     Create TikTok API session with retry logic.
@@ -56,8 +142,18 @@ async def create_tiktok_session(api: TikTokApi) -> None:
                 raise session_error
 
 
-async def main() -> None:
-    """Main application entry point with error handling."""
+async def main(args: argparse.Namespace) -> int:
+    """
+    Main application entry point with error handling.
+
+    Args:
+        args: Parsed command-line arguments from parse_args.
+
+    Returns:
+        int: Process exit status; in batch mode 1 if the session could
+            not be created or any video failed to download, else 0.
+    """
+    batch = bool(args.user or args.trending)
     print("\n" + "=" * 60)
     print("  TikTok Downloader")
     print("=" * 60)
@@ -68,15 +164,27 @@ async def main() -> None:
             await create_tiktok_session(api)
             print("✓ Ready\n")
 
+            if args.user:
+                window_size = None if args.window == 'all' else \
+                    int(args.window)
+                ok = await run_username_download(
+                    api, args.user, args.sort, window_size, args.count
+                )
+                return 0 if ok else 1
+
+            if args.trending:
+                ok = await run_trending_download(api, args.count)
+                return 0 if ok else 1
+
             while True:
                 print("-" * 60)
-                choice = input(
+                choice = (await ainput(
                     "Download by:\n"
                     "  [1] Username\n"
                     "  [2] Trending\n"
                     "  [q] Quit\n\n"
                     "Choice: "
-                ).strip().lower()
+                )).strip().lower()
 
                 if choice in ['q', 'quit', 'exit']:
                     break
@@ -99,6 +207,7 @@ async def main() -> None:
         print("  • Firewall may be blocking browser automation")
         print("  • If timeout persists, TikTok may be rate-limiting "
               "your IP")
+        return 1 if batch else 0
 
     finally:
         cleanup_browser()
@@ -106,9 +215,15 @@ async def main() -> None:
         print("  Goodbye!")
         print("=" * 60 + "\n")
 
+    return 0
+
 
 if __name__ == "__main__":
+    cli_args = parse_args()
     try:
-        asyncio.run(main())
+        sys.exit(asyncio.run(main(cli_args)))
     except KeyboardInterrupt:
         print("\n\n👋 Exiting...")
+        # An interrupted batch must not look like a success to cron
+        if cli_args.user or cli_args.trending:
+            sys.exit(130)
@@ -1,81 +1,222 @@
 """User interface and interaction logic with PEP 8 compliance."""
-from typing import Optional, List, Tuple, Any
-from fetcher import get_user_info, get_user_posts, get_trending_posts
-from downloader import download_post
+import asyncio
+import logging
+import logging.handlers
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Optional, List, Any, AsyncIterator, Union, Dict, FrozenSet, Deque,
+    Sequence
+)
+from fetcher import (
+    WINDOWED_SORTS, get_user_info, get_user_posts, stream_trending_posts,
+    stream_user_posts
+)
+from downloader import ROW_FMT, download_post, prefetch_download
+from display import LiveTable, write_frames
+from config import read_int_property
+from ui_prefs import load_prefs, save_prefs
+
+
+# Maximum number of videos downloaded at the same time
+MAX_CONCURRENT_DOWNLOADS = read_int_property('MAX_CONCURRENT_DOWNLOADS', 8)
+
+# Horizontal rule framing the download table and failure summary
+SEP = "─" * 70
+
+# Download table header, aligned with the rows download_post prints
+_HEADER = ROW_FMT('#', 'Video ID', 'Views', 'Date', 'Status')
+
+# Upper bound for the number of videos requested in one run
+MAX_DOWNLOAD_COUNT = 10000
+
+# Most recent failures listed in the summary; older ones are only counted
+MAX_LISTED_FAILURES = 500
+
+# Download table header and summary lines are logged rather than printed
+# and written out in batches of LOG_BATCH_SIZE, or when flushed
+LOG_BATCH_SIZE = 16
+
+
+class BatchedStdoutHandler(logging.handlers.BufferingHandler):
+    """Logging handler that writes each batch of records to stdout at once."""
+
+    def flush(self) -> None:
+        """Write all buffered records in a single write and clear them."""
+        self.acquire()
+        try:
+            if self.buffer:
+                sys.stdout.write("".join(
+                    self.format(record) + "\n" for record in self.buffer
+                ))
+                sys.stdout.flush()
+                self.buffer.clear()
+        finally:
+            self.release()
+
+
+logger = logging.getLogger("tiktok.ui")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_LOG_BUFFER = BatchedStdoutHandler(LOG_BATCH_SIZE)
+logger.addHandler(_LOG_BUFFER)
+
+# Answers accepted at any prompt to return to the previous menu
+_BACK_ANSWERS: FrozenSet[str] = frozenset({"b", "back"})
+
+# Fetch window menu choices mapped to window sizes (None means ALL)
+_WINDOW_SIZES: Dict[str, Optional[int]] = {
+    "1": 50, "2": 200, "3": 500, "4": None
+}
+
+# Fetch status wording for the sorts that rank a fetch window
+_STATUS_TEMPLATES: Dict[str, str] = {
+    "2": "top {count} most viewed from {window_msg}",
+    "3": "{count} oldest from {window_msg}",
+}
+
+
+def _settle(future: "asyncio.Future[str]", line: Optional[str],
+            error: Optional[BaseException]) -> None:
+    """Resolve a pending ainput() unless it was already cancelled."""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(line)
+
+
+async def ainput(prompt: str = "") -> str:
+    """
+    Read a line from the terminal without blocking the event loop.
 
+    The read runs on a daemon thread rather than an executor, so when
+    Ctrl-C cancels the prompt, shutdown does not wait for a line that
+    will never be entered.
 
-def get_sorting_choice() -> Optional[str]:
+    Args:
+        prompt: Text shown before reading.
+
+    Returns:
+        str: Line entered by the user, without the trailing newline.
+
+    Raises:
+        EOFError: If stdin is closed.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def read() -> None:
+        """Read the line and hand it back to the loop."""
+        line, error = None, None
+        try:
+            line = input(prompt)
+        except Exception as e:
+            error = e
+        try:
+            loop.call_soon_threadsafe(_settle, future, line, error)
+        except RuntimeError:
+            pass  # Loop already closed; nobody is waiting
+
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+
+async def get_sorting_choice(default: str = "1") -> Optional[str]:
     """
     Prompt user to select video sorting method.
 
+    Args:
+        default: Choice used when the user just presses Enter.
+
     Returns:
         Optional[str]: Sorting choice ('1', '2', '3') or None if user
             wants to go back.
     """
-    sort_choice = input(
+    sort_choice = (await ainput(
         "\nDownload which videos:\n"
-        "  [1] Most recent (default)\n"
+        "  [1] Most recent\n"
         "  [2] Most viewed/popular\n"
         "  [3] Oldest\n"
         "  [b] Back\n\n"
-        "Choice: "
-    ).strip() or "1"
+        f"Choice [{default}]: "
+    )).strip() or default
 
-    if sort_choice.lower() in ['b', 'back']:
+    if sort_choice.lower() in _BACK_ANSWERS:
         return None
 
     return sort_choice
 
 
-def get_fetch_window(sort_choice: str) -> Optional[int]:
+async def get_fetch_window(
+    sort_choice: str,
+    default: Optional[int] = 50
+) -> Optional[int]:
     """
     Prompt user to select fetch window size for sorting operations.
 
     Args:
         sort_choice: The sorting method ('2' for most viewed, '3' for
             oldest).
+        default: Window size used when the user just presses Enter.
 
     Returns:
         Optional[int]: Window size (50, 200, 500, or None for ALL) or
             -1 if user wants to go back.
     """
-    if sort_choice not in ["2", "3"]:
+    if sort_choice not in WINDOWED_SORTS:
         return None
 
+    default_key = next(
+        (key for key, size in _WINDOW_SIZES.items() if size == default),
+        "1"
+    )
+
     window_label = "most viewed" if sort_choice == "2" else "oldest"
-    window_input = input(
+    window_input = (await ainput(
         f"\nFetch window for {window_label}:\n"
         "  [1] Recent 50 videos (fast)\n"
         "  [2] Recent 200 videos (medium)\n"
         "  [3] Recent 500 videos (slow)\n"
         "  [4] ALL videos (very slow)\n"
         "  [b] Back\n\n"
-        "Choice: "
-    ).strip() or "1"
+        f"Choice [{default_key}]: "
+    )).strip() or default_key
 
-    if window_input.lower() in ['b', 'back']:
+    if window_input.lower() in _BACK_ANSWERS:
         return -1
 
-    return {"1": 50, "2": 200, "3": 500, "4": None}.get(window_input, 50)
+    return _WINDOW_SIZES.get(window_input, 50)
 
 
-def get_download_count() -> Optional[int]:
+async def get_download_count(default: int = 10) -> Optional[int]:
     """
     Prompt user to specify number of videos to download.
 
+    Args:
+        default: Count used when the input is empty or not a number.
+
     Returns:
-        Optional[int]: Number of videos to download or None if user
-            wants to go back.
+        Optional[int]: Number of videos to download, clamped to
+            1..MAX_DOWNLOAD_COUNT, or None if user wants to go back.
     """
-    count_input = input(
+    count_input = (await ainput(
         "\n📊 Number of videos to download "
-        "(default 10, or 'b' to go back): "
-    ).strip()
+        f"(default {default}, max {MAX_DOWNLOAD_COUNT}, "
+        "or 'b' to go back): "
+    )).strip()
 
-    if count_input.lower() in ['b', 'back']:
+    if count_input.lower() in _BACK_ANSWERS:
         return None
 
-    return int(count_input) if count_input.isdigit() else 10
+    try:
+        count = int(count_input)
+    except ValueError:
+        return default
+    return max(1, min(count, MAX_DOWNLOAD_COUNT))
 
 
 def print_fetch_status(
@@ -95,72 +236,124 @@ def print_fetch_status(
     """
     prefix = f"of @{source_name}" if source_name != "trending" else ""
 
-    if sort_choice == "2":
+    template = _STATUS_TEMPLATES.get(sort_choice)
+    if template:
         window_msg = (
-            f"recent {window_size}"
-            if window_size
-            else "ALL video metadata"
+            f"recent {window_size}" if window_size else "ALL video metadata"
         )
-        msg = f"top {count} most viewed from {window_msg}"
-        print(f"\n🔍 Fetching {msg} {prefix}...")
-    elif sort_choice == "3":
-        window_msg = (
-            f"recent {window_size}"
-            if window_size
-            else "ALL video metadata"
-        )
-        msg = f"{count} oldest from {window_msg}"
-        print(f"\n🔍 Fetching {msg} {prefix}...")
+        msg = template.format(count=count, window_msg=window_msg)
     else:
         video_label = "video(s)" if source_name != "trending" else \
             "trending video(s)"
-        print(f"\n🔍 Fetching {count} most recent {video_label} {prefix}...")
+        msg = f"{count} most recent {video_label}"
+
+    print(f"\n🔍 Fetching {msg} {prefix}...")
 
 
 async def handle_username_download(api: Any) -> None:
     """
     Handle username-based video downloads with sorting options.
 
+    The answers given last time are offered as defaults and the new
+    answers are saved for the next run.
+
     Args:
         api: TikTokApi instance for fetching videos.
     """
-    username = input(
-        "\n👤 TikTok username (or 'b' to go back): @"
-    ).strip()
-
-    if username.lower() in ['b', 'back']:
+    prefs = load_prefs()
+    last_username = prefs.get("username")
+    if not isinstance(last_username, str) or not last_username:
+        last_username = "tiktok"
+    last_sort = prefs.get("sort")
+    if last_sort not in ["1", "2", "3"]:
+        last_sort = "1"
+    last_window = prefs.get("window", 50)
+    if last_window not in _WINDOW_SIZES.values():
+        last_window = 50
+    last_count = prefs.get("count")
+    if not isinstance(last_count, int) or last_count <= 0:
+        last_count = 10
+    last_count = min(last_count, MAX_DOWNLOAD_COUNT)
+
+    username = (await ainput(
+        f"\n👤 TikTok username [{last_username}] (or 'b' to go back): @"
+    )).strip()
+
+    if username.lower() in _BACK_ANSWERS:
         return
 
     if not username:
-        username = "tiktok"
+        username = last_username
 
     # Fetch and display user info
     print(f"\n🔍 Fetching user info for @{username}...")
     user_info_success = await get_user_info(api, username)
 
     if not user_info_success:
-        retry = input("\nContinue anyway? [y/n]: ").strip().lower()
+        retry = (await ainput("\nContinue anyway? [y/n]: ")).strip().lower()
         if retry not in ['y', 'yes']:
             return
 
     # Get sorting choice
-    sort_choice = get_sorting_choice()
+    sort_choice = await get_sorting_choice(last_sort)
     if sort_choice is None:
         return
 
     # Get fetch window if needed
-    window_size = get_fetch_window(sort_choice)
+    window_size = await get_fetch_window(sort_choice, last_window)
     if window_size == -1:
         return
 
     # Get download count
-    count = get_download_count()
+    count = await get_download_count(last_count)
     if count is None:
         return
 
+    # Remember the answers; keep the old window if none was asked for
+    prefs.update(username=username, sort=sort_choice, count=count)
+    if sort_choice in WINDOWED_SORTS:
+        prefs["window"] = window_size
+    save_prefs(prefs)
+
+    await run_username_download(
+        api, username, sort_choice, window_size, count
+    )
+
+
+async def run_username_download(
+    api: Any,
+    username: str,
+    sort_choice: str,
+    window_size: Optional[int],
+    count: int
+) -> bool:
+    """
+    Fetch and download a user's videos without prompting.
+
+    Shared by the interactive menu and the command-line batch mode.
+
+    Args:
+        api: TikTokApi instance for fetching videos.
+        username: TikTok username (without @ symbol).
+        sort_choice: Sorting method ('1', '2', or '3').
+        window_size: Fetch window for sorting (None for ALL).
+        count: Number of videos to download.
+
+    Returns:
+        bool: True if videos were found and all of them downloaded.
+    """
     # Display fetch status
     print_fetch_status(count, sort_choice, window_size, username)
 
+    # Most recent needs no ranking, so downloads start as soon as the
+    # first videos arrive
+    if sort_choice not in WINDOWED_SORTS:
+        notes: List[str] = []
+        return await download_videos(
+            stream_user_posts(api, username, count, notes.append),
+            username, sort_choice, notes
+        )
+
     # Fetch videos
     videos = await get_user_posts(
         api, username, count, sort_choice, window_size
@@ -168,10 +361,10 @@ async def handle_username_download(api: Any) -> None:
 
     if not videos:
         print("⚠ No videos found or blocked by TikTok")
-        return
+        return False
 
     print(f"✓ Found {len(videos)} video(s)\n")
-    await download_videos(videos, username, sort_choice)
+    return await download_videos(videos, username, sort_choice)
 
 
 async def handle_trending_download(api: Any) -> None:
@@ -185,62 +378,193 @@ async def handle_trending_download(api: Any) -> None:
     Args:
         api: TikTokApi instance for fetching videos.
     """
-    count = get_download_count()
+    count = await get_download_count()
     if count is None:
         return
 
+    await run_trending_download(api, count)
+
+
+async def run_trending_download(api: Any, count: int) -> bool:
+    """
+    Stream and download trending videos without prompting.
+
+    Args:
+        api: TikTokApi instance for fetching videos.
+        count: Number of trending videos to download.
+
+    Returns:
+        bool: True if videos were found and all of them downloaded.
+    """
     print(f"\n🔍 Fetching {count} trending videos from For You Page...")
 
-    videos = await get_trending_posts(api, count)
+    # Trending is never re-sorted, so downloads start as soon as the
+    # first videos arrive
+    notes: List[str] = []
+    return await download_videos(
+        stream_trending_posts(api, count, notes.append), "trending", "1",
+        notes
+    )
 
-    if not videos:
-        print("⚠ No videos found or blocked by TikTok")
-        return
 
-    print(f"✓ Found {len(videos)} video(s)\n")
-    await download_videos(videos, "trending", "1")
+async def _iterate(
+    videos: Union[List[Any], AsyncIterator[Any]]
+) -> AsyncIterator[Any]:
+    """
+    Iterate over a list or an async iterator of videos alike.
+
+    Args:
+        videos: List or async iterator of video objects.
+
+    Yields:
+        Any: Video objects in order.
+    """
+    if isinstance(videos, list):
+        for video in videos:
+            yield video
+    else:
+        async for video in videos:
+            yield video
 
 
 async def download_videos(
-    videos: List[Any],
+    videos: Union[List[Any], AsyncIterator[Any]],
     folder_name: str,
-    sort_choice: str
-) -> None:
+    sort_choice: str,
+    notes: Sequence[str] = ()
+) -> bool:
     """
-    Download a list of videos and display results with failure summary.
+    Download videos and display results with failure summary.
+
+    Videos are fed through a queue to MAX_CONCURRENT_DOWNLOADS workers,
+    so an async iterator is downloaded while it is still being fetched.
+    Each video's URL lookups start in the background as soon as it is
+    queued, which is at most one video ahead of the busy workers.
+    Finished rows are printed in row order, while running downloads
+    show live progress below them; all table output goes through one
+    writer task that owns stdout.
 
     Args:
-        videos: List of video objects to download.
+        videos: List or async iterator of video objects to download.
         folder_name: Destination folder name for downloads.
         sort_choice: Sorting method used ('1', '2', or '3').
-    """
-    # Display table header
-    print("📥 Downloading videos...\n")
-    print("─" * 70)
-    print(f"{'#':<4} {'Video ID':<20} {'Views':<15} "
-          f"{'Date':<12} {'Status':<20}")
-    print("─" * 70)
+        notes: Lines collected while videos is iterated, such as fetch
+            errors; printed once the table is done, since the writer
+            owns stdout until then.
 
+    Returns:
+        bool: True if at least one video was processed, every one was
+            downloaded or already present and no notes were collected.
+    """
+    # Display table header; flushed before the writer takes over stdout
+    logger.info("📥 Downloading videos...\n")
+    logger.info(SEP)
+    logger.info(_HEADER)
+    logger.info(SEP)
+    _LOG_BUFFER.flush()
+
+    # Worker threads hand frames to the loop; only the writer touches
+    # stdout until the batch is over
+    loop = asyncio.get_running_loop()
+    frames: asyncio.Queue = asyncio.Queue()
+    writer = asyncio.create_task(write_frames(frames))
+
+    def emit(frame: str) -> None:
+        """Queue a frame for the writer; dropped once the loop is closed."""
+        try:
+            loop.call_soon_threadsafe(frames.put_nowait, frame)
+        except RuntimeError:
+            pass  # A display failure must never fail a download
+
+    table = LiveTable(emit=emit)
+    # The workers plus one lookahead video may be in flight at once;
+    # they get their own threads so the limit holds whatever the size
+    # of the loop's default executor
+    slots = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS + 1)
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOWNLOADS + 1)
+    # Set when the batch ends, so downloads still running in the pool
+    # stop at their next block instead of delaying interpreter exit
+    cancel = threading.Event()
+    pending: asyncio.Queue = asyncio.Queue()
+    processed = 0
     success_count = 0
-    failures = []  # Collect failure details
-
-    for i, video in enumerate(videos, 1):
-        result = await download_post(video, folder_name, i, sort_choice)
-        success, video_id, views, date, error_detail = result
-
-        if success:
-            success_count += 1
-        elif error_detail:
-            failures.append(error_detail)
-
-    print("─" * 70)
-    print(f"\n✓ Completed: {success_count}/{len(videos)} "
-          f"successful downloads")
+    failures: Deque[str] = deque(maxlen=MAX_LISTED_FAILURES)
+    dropped_failures = 0
+
+    async def produce() -> None:
+        """Queue numbered videos, then one stop marker per worker."""
+        try:
+            row_num = 0
+            async for video in _iterate(videos):
+                await slots.acquire()
+                row_num += 1
+                prefetch = loop.run_in_executor(
+                    executor, prefetch_download,
+                    video, folder_name, row_num, sort_choice
+                )
+                pending.put_nowait((row_num, video, prefetch))
+        finally:
+            for _ in range(MAX_CONCURRENT_DOWNLOADS):
+                pending.put_nowait(None)
+
+    async def consume() -> None:
+        """Download queued videos until a stop marker arrives."""
+        nonlocal processed, success_count, dropped_failures
+        while (item := await pending.get()) is not None:
+            row_num, video, prefetch = item
+            try:
+                await prefetch
+                success, _, _, _, error_detail = await download_post(
+                    video, folder_name, row_num, sort_choice, table, executor,
+                    cancel
+                )
+            finally:
+                slots.release()
+
+            processed += 1
+            if success:
+                success_count += 1
+            elif error_detail:
+                if len(failures) == MAX_LISTED_FAILURES:
+                    dropped_failures += 1
+                failures.append(error_detail)
+
+    try:
+        await asyncio.gather(
+            produce(), *[consume() for _ in range(MAX_CONCURRENT_DOWNLOADS)]
+        )
+    finally:
+        # Stop downloads abandoned by a cancelled batch rather than
+        # waiting for them
+        cancel.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        frames.put_nowait(None)
+        await writer
+
+    for note in notes:
+        logger.info(note)
+
+    if not processed:
+        logger.info(SEP)
+        logger.info("⚠ No videos found or blocked by TikTok")
+        _LOG_BUFFER.flush()
+        return False
+
+    logger.info(SEP)
+    logger.info(f"\n✓ Completed: {success_count}/{processed} "
+                f"successful downloads")
 
     # Display failure summary if any failures occurred
     if failures:
-        print("\n⚠ Download Failures Summary:")
-        print("─" * 70)
+        logger.info("\n⚠ Download Failures Summary:")
+        logger.info(SEP)
+        if dropped_failures:
+            logger.info(f"  ... ({dropped_failures} earlier failures "
+                        f"not shown)")
         for detail in failures:
-            print(f"  • {detail}")
-        print("─" * 70)
+            logger.info(f"  • {detail}")
+        logger.info(SEP)
+
+    # Show the totals right away instead of waiting for a full batch
+    _LOG_BUFFER.flush()
+    return success_count == processed and not notes
@@ -0,0 +1,46 @@
+"""Remembered prompt answers, kept between runs."""
+import json
+import os
+from typing import Any, Dict
+
+
+# File holding the answers given in the previous run
+PREFS_PATH = os.path.join(
+    os.path.expanduser("~"), ".tiktok-downloader", "prefs.json"
+)
+
+
+def load_prefs() -> Dict[str, Any]:
+    """
+    Load the answers saved by the previous run.
+
+    Returns:
+        Dict[str, Any]: Saved answers, or an empty dict if none were
+            saved or the file cannot be read.
+    """
+    try:
+        with open(PREFS_PATH, 'r', encoding='utf-8') as file:
+            prefs = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return prefs if isinstance(prefs, dict) else {}
+
+
+def save_prefs(prefs: Dict[str, Any]) -> None:
+    """
+    Save answers for the next run.
+
+    The file is replaced atomically; failures are ignored since the
+    answers are only a convenience.
+
+    Args:
+        prefs: JSON-serializable answers to save.
+    """
+    temp_path = f"{PREFS_PATH}.tmp"
+    try:
+        os.makedirs(os.path.dirname(PREFS_PATH), exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(prefs, file)
+        os.replace(temp_path, PREFS_PATH)
+    except (OSError, TypeError, ValueError):
+        pass